@@ -0,0 +1,109 @@
+"""
+Memory benchmark for Mail Flow Manager
+
+Streams synthetic RFC822 messages through the parts of the pipeline that
+keep state between emails (EmailRecord parsing, thread tracking and the
+near-duplicate index) and reports retained memory as the count grows.
+LLM stages are replaced by fixed results, since only retention is measured.
+With bounded structures the numbers should stay flat.
+
+Usage:
+    python benchmark_memory.py [messages]
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+from modules.email_record import EmailRecord
+from modules.near_duplicate import NearDuplicateIndex
+from modules.thread_tracker import ThreadTracker
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+TEMPLATES = [
+    "Hi {name}, your order #{n} has shipped and will arrive on {day}. Track it in your account.",
+    "Reminder: the {day} sync about project {n} moved to 3pm. Agenda attached, {name}.",
+    "Your statement for account ending {n} is ready. Log in to review recent activity, {name}.",
+    "{name} commented on issue #{n}: please take another look before {day}.",
+]
+
+# Letter-only words (digits are masked by normalization, so they would all collapse)
+VOCABULARY = ["".join(random.Random(k).choices(string.ascii_lowercase, k=7)) for k in range(5000)]
+
+def synthetic_message(i: int) -> bytes:
+    """Build a small RFC822 message; every third one replies to the previous.
+
+    One in four messages uses a shared template (near-duplicate hits); the rest
+    get distinct random bodies so the near-duplicate index reaches its cap.
+    """
+    headers = [
+        f"Subject: Update {i % 500}",
+        f"From: sender{i % 97}@example.com",
+        f"Message-ID: <msg-{i}@example.com>",
+    ]
+    if i % 3:
+        headers.append(f"In-Reply-To: <msg-{i - 1}@example.com>")
+    if i % 4 == 0:
+        body = TEMPLATES[i % len(TEMPLATES)].format(name=f"user{i % 1000}", n=i, day=f"day {i % 28}")
+    else:
+        body = " ".join(random.Random(i).choices(VOCABULARY, k=25))
+    return ("\r\n".join(headers) + "\r\n\r\n" + body + "\r\n").encode()
+
+def rss_mb() -> float:
+    """Current resident set size in MB (Linux), else peak RSS, else 0"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def main():
+    """Stream messages through the stateful pipeline parts and report memory"""
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    checkpoint = max(total // 10, 1)
+
+    index = NearDuplicateIndex()
+    tracker = ThreadTracker()
+
+    print(f"🧠 Memory benchmark ({total:,} messages)")
+    print("=" * 60)
+    print(f"   {'messages':>10} {'RSS MB':>10} {'msgs/s':>8}")
+
+    start = time.perf_counter()
+    samples = []
+    for i in range(1, total + 1):
+        record = EmailRecord.from_bytes(synthetic_message(i), msg_id=str(i).encode())
+        thread = tracker.resolve_thread(record.message_id, record.in_reply_to, record.references)
+
+        fingerprint = index.fingerprint(record.subject, record.body)
+        match = index.lookup(fingerprint, email_id=record.subject) if fingerprint is not None else None
+        if fingerprint is not None and match is None:
+            index.add(fingerprint, record.subject, "Work", "medium", "Fixed summary")
+        thread.update("Fixed summary", "Work", "medium")
+
+        if i % checkpoint == 0:
+            current = rss_mb()
+            samples.append(current)
+            rate = i / (time.perf_counter() - start)
+            print(f"   {i:>10,} {current:>10.1f} {rate:>8.0f}")
+
+    # Structures fill up to their caps early on; compare the second half
+    middle, final = samples[len(samples) // 2], samples[-1]
+    growth = (final - middle) / middle * 100 if middle else 0.0
+    print(f"\nRSS growth over the second half: {growth:+.1f}%")
+    print(f"Index: {index.get_stats()} (cap {index.max_entries:,})")
+    print(f"Threads: {tracker.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Cold start benchmark for Mail Flow Manager
+
+Spawns fresh Python interpreters and compares importing the monitor on the
+current lazy startup path against the eager import chain it replaced.
+
+The baseline is either a frozen copy of what `import modules.gmailmonitor`
+used to load (default), or the monitor exported from an older git revision
+with --baseline-ref, e.g. the commit before lazy loading was introduced.
+
+Any ImportError aborts the benchmark: a scenario that silently skips a
+missing dependency would look faster than it is.
+
+Usage:
+    python benchmark_startup.py [--runs N] [--baseline-ref REF]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CURRENT_CODE = "import modules.gmailmonitor"
+
+# Frozen copy of the module-level work the monitor did before lazy loading:
+# config ran load_dotenv() on import, base_ai_processor imported requests,
+# and gmailmonitor imported imaplib plus all three processors up front.
+BASELINE_CODE = """
+from dotenv import load_dotenv
+load_dotenv()
+import imaplib, email, time, os, re
+from datetime import datetime
+from email.header import decode_header
+import requests
+import config
+import utils.ai_prompts
+import modules.base_ai_processor
+import modules.categorizer
+import modules.summarizer
+import modules.importance
+import modules.gmailmonitor
+"""
+
+def run_once(code, cwd):
+    """Import in a fresh interpreter; abort loudly if the import fails"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd,
+                            capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        print(f"❌ Import failed in {cwd}:\n{result.stderr.strip()}")
+        print("Install the dependencies first: pip install -r requirements.txt")
+        sys.exit(1)
+    return elapsed
+
+def measure(code, runs, cwd):
+    """Return wall-clock times (ms) of running code in fresh interpreters"""
+    return [run_once(code, cwd) for _ in range(runs)]
+
+def export_revision(ref, target):
+    """Write the tree at a git revision into target (no checkout of the work tree)"""
+    archive = subprocess.run(["git", "archive", "--format=tar", ref],
+                             capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", target], input=archive.stdout, check=True)
+
+def main():
+    """Measure the baseline and current startup paths and print the ratio"""
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Interpreter launches per scenario")
+    parser.add_argument("--baseline-ref", help="Git revision to use as the eager baseline")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"⏱️ Cold start benchmark ({args.runs} runs each)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        if args.baseline_ref:
+            export_revision(args.baseline_ref, baseline_dir)
+            scenarios = {
+                f"baseline ({args.baseline_ref})": (CURRENT_CODE, baseline_dir),
+                "current (lazy)": (CURRENT_CODE, here),
+            }
+        else:
+            scenarios = {
+                "baseline (frozen eager imports)": (BASELINE_CODE, here),
+                "current (lazy)": (CURRENT_CODE, here),
+            }
+
+        # Interpreter start-up, subtracted from each scenario
+        interpreter = statistics.median(measure("pass", args.runs, here))
+        print(f"   {'interpreter only':<34} {interpreter:8.2f} ms")
+
+        results = {}
+        for label, (code, cwd) in scenarios.items():
+            results[label] = statistics.median(measure(code, args.runs, cwd)) - interpreter
+            print(f"   {label:<34} {results[label]:8.2f} ms (+ interpreter)")
+
+    baseline, current = results.values()
+    if current > 0:
+        print(f"\n✅ Current startup imports {baseline / current:.1f}x faster than the baseline")
+
+if __name__ == "__main__":
+    main()
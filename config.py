@@ -1,12 +1,37 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()  # loads .env into environment
+
+class _EnvSetting:
+    """Reads an environment variable on first access, loading .env beforehand"""
+
+    def __init__(self, env_name):
+        self.env_name = env_name
+
+    def __get__(self, instance, owner):
+        owner.load()
+        return os.getenv(self.env_name)
+
 
 class Config:
-    OPENAI_API_KEY = os.getenv("API_KEY_OPENAI")
-    MAIL_USERNAME = os.getenv("MAIL_USERNAME")
-    MAIL_APP_PASSWORD = os.getenv("MAIL_APP_PASSWORD")
+    OPENAI_API_KEY = _EnvSetting("API_KEY_OPENAI")
+    MAIL_USERNAME = _EnvSetting("MAIL_USERNAME")
+    MAIL_APP_PASSWORD = _EnvSetting("MAIL_APP_PASSWORD")
+
+    # Optional: priority scheduling and urgent mail notifications
+    PRIORITY_SENDERS = _EnvSetting("PRIORITY_SENDERS")        # comma-separated addresses/domains
+    NOTIFY_WEBHOOK_URL = _EnvSetting("NOTIFY_WEBHOOK_URL")
+    NOTIFY_COMMAND = _EnvSetting("NOTIFY_COMMAND")            # receives alert JSON on stdin
+    NOTIFY_SOCKET = _EnvSetting("NOTIFY_SOCKET")              # Unix socket path
+
+    _loaded = False
+
+    @classmethod
+    def load(cls):
+        """Load .env into the environment once, on first use instead of at import time"""
+        if not cls._loaded:
+            from dotenv import load_dotenv
+            load_dotenv()  # loads .env into environment
+            cls._loaded = True
 
     @classmethod
     def validate(cls):
@@ -14,13 +14,70 @@ File Organization:
 - Evaluated emails → 'evaluated/category/priority/' folders (with Category, Importance, Summary, Original message)
 
 Both use date-subject filename format: YYYY-MM-DD_Subject.txt
+
+Usage:
+    python main.py                    # Run the mail monitor
+    python main.py --profile-startup  # Report import times of the pipeline modules
 """
 
-from modules.gmailmonitor import GmailMonitor
+import argparse
+import statistics
+import subprocess
+import sys
+
 from config import Config
 
+# Modules a full run loads: startup path first, lazy ones after
+STARTUP_MODULES = [
+    "config",
+    "modules.gmailmonitor",
+    "dotenv",
+    "requests",
+    "utils.ai_prompts",
+    "modules.base_ai_processor",
+    "modules.categorizer",
+    "modules.summarizer",
+    "modules.importance",
+]
+
+# Runs in a fresh interpreter so nothing is cached from main.py or earlier modules
+IMPORT_TIMER = """
+import importlib, time
+start = time.perf_counter()
+importlib.import_module({name!r})
+print((time.perf_counter() - start) * 1000)
+"""
+
+def profile_startup(runs=5):
+    """Import each pipeline module in fresh interpreters and report its cold import time"""
+    print(f"⏱️ Startup import profile (cold import incl. dependencies, median of {runs} runs):")
+    for name in STARTUP_MODULES:
+        timings = []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, "-c", IMPORT_TIMER.format(name=name)],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+                print(f"   {name:<28} not available ({error})")
+                break
+            timings.append(float(result.stdout))
+        else:
+            print(f"   {name:<28} {statistics.median(timings):8.2f} ms")
+    print("For a per-module breakdown run: python -X importtime -c \"import modules.gmailmonitor\"")
+
 def main():
     """Main entry point for the Mail Flow Manager"""
+    parser = argparse.ArgumentParser(description="Mail Flow Manager")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report import times of the pipeline modules and exit")
+    args = parser.parse_args()
+    
+    if args.profile_startup:
+        profile_startup()
+        return
+    
+    from modules.gmailmonitor import GmailMonitor
+    
     print("🚀 Mail Flow Manager Starting...")
     print("📧 Pipeline: Monitor → Categorize → Summarize → Rate Importance")
     print(f"Listening on {Config.MAIL_USERNAME} for new emails...")
@@ -1,9 +1,10 @@
 """
 Base class for AI-powered email processors to eliminate code duplication
 """
-import requests
+import json
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 from config import Config
 
 
@@ -18,19 +19,39 @@ class BaseAIProcessor(ABC):
             "Content-Type": "application/json"
         }
         self.model = "meta-llama/llama-4-scout-17b-16e-instruct"
+        self._session = None
         
-    def _make_api_request(self, prompt: str, system_message: str) -> str:
-        """Make API request with standardized error handling"""
-        payload = {
-            "model": self.model,
+        # Single-label classifiers: cap output and optionally ask for a JSON schema
+        # enum (only honoured by backends supporting structured outputs)
+        self.label_max_tokens = 16
+        self.use_json_schema = False
+        self._label_patterns = {}
+
+    @property
+    def session(self):
+        """HTTP session created on first request so importing processors stays cheap"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+        return self._session
+        
+    def _build_payload(self, prompt: str, system_message: str, model: str = None) -> Dict[str, Any]:
+        """Build the chat completion payload shared by all request types"""
+        return {
+            "model": model or self.model,
             "messages": [
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": prompt}
             ]
         }
         
+    def _make_api_request(self, prompt: str, system_message: str, model: str = None) -> str:
+        """Make API request with standardized error handling"""
+        payload = self._build_payload(prompt, system_message, model)
+        
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload)
+            response = self.session.post(self.api_url, json=payload)
             data = response.json()
             
             if "error" in data:
@@ -43,6 +64,101 @@ class BaseAIProcessor(ABC):
         except Exception as e:
             return f"Request Failed: {e}"
     
+    def _get_label_patterns(self, labels: List[str]):
+        """
+        Compiled patterns for a leading label while streaming, a leading label
+        at end of stream, and any label not negated ("not spam") in free text.
+        Only a leading label may stop the stream, so "Not urgent, just low"
+        never stops on "urgent".
+        """
+        key = tuple(labels)
+        if key not in self._label_patterns:
+            alternatives = "|".join(re.escape(label) for label in labels)
+            self._label_patterns[key] = (
+                re.compile(rf"^\W*({alternatives})\b(?=\W)", re.IGNORECASE),
+                re.compile(rf"^\W*({alternatives})\b", re.IGNORECASE),
+                re.compile(rf"(?<!\bnot )(?<!\bno )\b({alternatives})\b", re.IGNORECASE)
+            )
+        return self._label_patterns[key]
+
+    def _match_label(self, text: str, labels: List[str], final: bool = False) -> str:
+        """Return the canonical label found in text, or an empty string"""
+        streaming_pattern, leading_pattern, anywhere_pattern = self._get_label_patterns(labels)
+        if final:
+            found = leading_pattern.search(text) or anywhere_pattern.search(text)
+        else:
+            found = streaming_pattern.search(text)
+        if not found:
+            return ""
+        matched = found.group(1).lower()
+        return next(label for label in labels if label.lower() == matched)
+
+    def _make_label_request(self, prompt: str, system_message: str, labels: List[str], model: str = None) -> str:
+        """
+        Stream a single-label classification and stop reading as soon as the
+        reply starts with a valid label. Otherwise the whole reply is read and
+        the first label that is not negated wins; raw text (for the caller's
+        usual matching) and error strings are returned as in _make_api_request.
+        """
+        payload = self._build_payload(prompt, system_message, model)
+        payload["stream"] = True
+        payload["max_tokens"] = self.label_max_tokens
+        if self.use_json_schema:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "label",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {"label": {"type": "string", "enum": list(labels)}},
+                        "required": ["label"],
+                        "additionalProperties": False
+                    }
+                }
+            }
+        
+        try:
+            response = self.session.post(self.api_url, json=payload, stream=True)
+            
+            # Backend ignored "stream": handle a regular JSON completion
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                data = response.json()
+                if "error" in data:
+                    return f"API Error: {data['error']['message']}"
+                elif "choices" in data and len(data["choices"]) > 0:
+                    text = data["choices"][0]["message"]["content"].strip()
+                    return self._match_label(text, labels, final=True) or text
+                return "No response from API"
+            
+            text = ""
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        return f"API Error: {chunk['error']['message']}"
+                    choices = chunk.get("choices") or [{}]
+                    text += choices[0].get("delta", {}).get("content") or ""
+                    
+                    label = self._match_label(text, labels)
+                    if label:
+                        return label  # Early exit: the rest of the completion is not needed
+            finally:
+                response.close()
+            
+            text = text.strip()
+            if not text:
+                return "No response from API"
+            return self._match_label(text, labels, final=True) or text
+            
+        except Exception as e:
+            return f"Request Failed: {e}"
+    
     @abstractmethod
     def process(self, email_content: str, **kwargs) -> Dict[str, Any]:
         """Abstract method that each processor must implement"""
@@ -1,38 +1,43 @@
 import os
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 from modules.base_ai_processor import BaseAIProcessor
 from utils.ai_prompts import AIPrompts
 
 
 class EmailCategorizer(BaseAIProcessor):
+    CATEGORIES = ["Promotion", "Spam", "Work", "Personal", "Finance", "Other"]
+
     def __init__(self, source_folder: str = None):
         super().__init__()
         self.source_folder = source_folder
-        self.CATEGORIES = ["Promotion", "Spam", "Work", "Personal", "Finance", "Other"]
+        self.prompt_template = AIPrompts.categorizer_template(self.CATEGORIES)
 
-    def fetch_all_emails(self) -> List[Dict]:
-        """Fetch all emails from folder (for batch processing)"""
+    def iter_emails(self) -> Iterator[Dict]:
+        """Yield emails from folder one at a time (for batch processing)"""
         if not self.source_folder:
             raise ValueError("Source folder not set.")
         
-        emails = []
-        for filename in os.listdir(self.source_folder):
-            if not filename.endswith(".txt"):
-                continue
-            path = os.path.join(self.source_folder, filename)
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            emails.append({"id": filename, "content": content})
-        return emails
+        with os.scandir(self.source_folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".txt"):
+                    continue
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                yield {"id": entry.name, "content": content}
 
-    def categorize_emails(self, emails: List[Dict]) -> List[Dict]:
-        """Categorize multiple emails"""
-        categorized = []
+    def fetch_all_emails(self) -> List[Dict]:
+        """Fetch all emails from folder (for batch processing)"""
+        return list(self.iter_emails())
+
+    def iter_categorized(self, emails: Iterable[Dict]) -> Iterator[Dict]:
+        """Categorize emails lazily; each body can be freed once its result is yielded"""
         for email_item in emails:
-            result = self.categorize_single_email(email_item['content'], email_item['id'])
-            categorized.append(result)
-        return categorized
+            yield self.categorize_single_email(email_item['content'], email_item['id'])
+
+    def categorize_emails(self, emails: Iterable[Dict]) -> List[Dict]:
+        """Categorize multiple emails"""
+        return list(self.iter_categorized(emails))
 
     def process(self, email_content: str, email_id: str = "single_email") -> Dict:
         """Process email for categorization"""
@@ -40,9 +45,9 @@ class EmailCategorizer(BaseAIProcessor):
         
     def categorize_single_email(self, email_content: str, email_id: str = "single_email") -> Dict:
         """Categorize a single email (main method used by Gmail Monitor)"""
-        prompt = AIPrompts.categorizer_prompt(email_content, self.CATEGORIES)
+        prompt = self.prompt_template.render(email_content=email_content)
         system_message = AIPrompts.get_system_message("categorizer")
-        raw_category = self._make_api_request(prompt, system_message)
+        raw_category = self._make_label_request(prompt, system_message, self.CATEGORIES)
         
         # Validate category is one of our expected ones
         if raw_category in self.CATEGORIES:
@@ -60,16 +65,19 @@ class EmailCategorizer(BaseAIProcessor):
 
         return {
             "id": email_id,
-            "content": email_content,
             "category": category
         }
 
-    def output_results(self, categorized_emails: List[Dict]):
+    def output_results(self, categorized_emails: Iterable[Dict]):
         """Display categorization results"""
         for email_item in categorized_emails:
             print(f"[{email_item['category']}] {email_item['id']}")
 
-    def save_results(self, categorized_emails: List[Dict], output_file="results.json"):
-        """Save categorization results to JSON file"""
+    def save_results(self, categorized_emails: Iterable[Dict], output_file="results.json"):
+        """Save categorization results to JSON file, writing one result at a time"""
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(categorized_emails, f, indent=2, ensure_ascii=False)
+            f.write("[")
+            for index, email_item in enumerate(categorized_emails):
+                f.write(",\n  " if index else "\n  ")
+                f.write(json.dumps(email_item, ensure_ascii=False))
+            f.write("\n]\n")
@@ -0,0 +1,80 @@
+"""
+Compact email record passed through the processing pipeline
+"""
+import email
+from email.header import decode_header
+from typing import Optional
+
+
+class EmailRecord:
+    """
+    One email reduced to the fields the pipeline needs.
+
+    Uses __slots__ and keeps only the decoded plain text body, so the raw
+    RFC822 bytes and parsed message tree can be freed right after parsing.
+    """
+
+    __slots__ = ("msg_id", "subject", "sender", "body", "message_id",
+                 "in_reply_to", "references", "gmail_thread_id", "received_at")
+
+    def __init__(self, subject: str, sender: str, body: str, msg_id=None,
+                 message_id: Optional[str] = None, in_reply_to: Optional[str] = None,
+                 references: Optional[str] = None, gmail_thread_id: Optional[str] = None,
+                 received_at: Optional[float] = None):
+        self.msg_id = msg_id
+        self.subject = subject
+        self.sender = sender
+        self.body = body
+        self.message_id = message_id
+        self.in_reply_to = in_reply_to
+        self.references = references
+        self.gmail_thread_id = gmail_thread_id
+        self.received_at = received_at  # IMAP arrival time (epoch seconds)
+
+    def __repr__(self):
+        return f"EmailRecord(msg_id={self.msg_id!r}, subject={self.subject[:40]!r})"
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, msg_id=None, gmail_thread_id: Optional[str] = None,
+                   received_at: Optional[float] = None) -> "EmailRecord":
+        """Parse raw RFC822 bytes into a record; nothing keeps a reference to raw"""
+        msg = email.message_from_bytes(raw)
+
+        # Decode Subject
+        subject, encoding = decode_header(msg["subject"] or "")[0]
+        if isinstance(subject, bytes):
+            subject = subject.decode(encoding if encoding else "utf-8")
+
+        return cls(
+            subject=subject,
+            sender=msg.get("from"),
+            body=cls.extract_body(msg),
+            msg_id=msg_id,
+            message_id=msg.get("Message-ID"),
+            in_reply_to=msg.get("In-Reply-To"),
+            references=msg.get("References"),
+            gmail_thread_id=gmail_thread_id,
+            received_at=received_at
+        )
+
+    @staticmethod
+    def extract_body(msg) -> str:
+        """Extracts the plain text body from the email object."""
+        body = ""
+        if msg.is_multipart():
+            for part in msg.walk():
+                content_type = part.get_content_type()
+                content_disposition = str(part.get("Content-Disposition"))
+
+                if content_type == "text/plain" and "attachment" not in content_disposition:
+                    try:
+                        body = part.get_payload(decode=True).decode()
+                    except:
+                        pass
+                    break
+        else:
+            try:
+                body = msg.get_payload(decode=True).decode()
+            except:
+                pass
+        return body
@@ -1,15 +1,17 @@
 from config import Config
-import imaplib
-import email
 import time
 import os
 import re
 from datetime import datetime
-from email.header import decode_header
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
 
-from modules.categorizer import EmailCategorizer
-from modules.summarizer import EmailSummarizer
-from modules.importance import ImportanceRater
+from modules.email_record import EmailRecord
+from modules.pipeline_policy import PipelinePolicies
+from modules.near_duplicate import NearDuplicateIndex
+from modules.thread_tracker import ThreadTracker
+from modules.priority_scheduler import PriorityScheduler
+from modules.notifier import UrgentNotifier
 
 class GmailMonitor:
     def __init__(self):
@@ -23,14 +25,56 @@ class GmailMonitor:
         self.raw_folder = "mails"        # Raw emails folder
         self.evaluated_folder = "evaluated"  # Processed emails folder
         
-        # Initialize processing modules
-        self.categorizer = EmailCategorizer()
-        self.summarizer = EmailSummarizer()
-        self.importance_rater = ImportanceRater()
+        # Processing modules are imported and created on first use
+        self._categorizer = None
+        self._summarizer = None
+        self._importance_rater = None
+        
+        # Per-category policies that can skip or cheapen later stages
+        self.policies = PipelinePolicies()
+        
+        # Reuse results of already evaluated near-identical (templated) emails
+        self.duplicate_index = NearDuplicateIndex(threshold=NearDuplicateIndex.DEFAULT_THRESHOLD, reuse_summary=False)
+        
+        # Conversation tracking for incremental thread summaries
+        self.thread_tracker = ThreadTracker()
+        
+        # Process likely-important mail first and alert on urgent/critical ratings
+        self.scheduler = PriorityScheduler(sender_allowlist=(Config.PRIORITY_SENDERS or "").split(","))
+        self.notifier = UrgentNotifier(
+            webhook_url=Config.NOTIFY_WEBHOOK_URL,
+            command=Config.NOTIFY_COMMAND,
+            socket_path=Config.NOTIFY_SOCKET
+        )
+
+    @property
+    def categorizer(self):
+        """Email categorizer, loaded lazily"""
+        if self._categorizer is None:
+            from modules.categorizer import EmailCategorizer
+            self._categorizer = EmailCategorizer()
+        return self._categorizer
+
+    @property
+    def summarizer(self):
+        """Email summarizer, loaded lazily"""
+        if self._summarizer is None:
+            from modules.summarizer import EmailSummarizer
+            self._summarizer = EmailSummarizer()
+        return self._summarizer
+
+    @property
+    def importance_rater(self):
+        """Importance rater, loaded lazily"""
+        if self._importance_rater is None:
+            from modules.importance import ImportanceRater
+            self._importance_rater = ImportanceRater()
+        return self._importance_rater
 
     def _connect(self):
         """Handles connection to Gmail IMAP"""
         try:
+            import imaplib  # Deferred: pulls in ssl/socket, only needed once connecting
             print("🔌 Connecting to Gmail...")
             self.mail = imaplib.IMAP4_SSL(self.imap_url)
             self.mail.login(self.username, self.password)
@@ -40,27 +84,6 @@ class GmailMonitor:
             print(f"❌ Connection failed: {e}")
             return False
 
-    def _get_email_body(self, msg):
-        """Extracts the plain text body from the email object."""
-        body = ""
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition"))
-
-                if content_type == "text/plain" and "attachment" not in content_disposition:
-                    try:
-                        body = part.get_payload(decode=True).decode()
-                    except:
-                        pass
-                    break
-        else:
-            try:
-                body = msg.get_payload(decode=True).decode()
-            except:
-                pass
-        return body
-
     def _sanitize_filename(self, subject):
         """Removes illegal characters from subject to create a valid filename."""
         # Replace non-alphanumeric chars (except spaces/dashes) with nothing
@@ -97,7 +120,7 @@ class GmailMonitor:
             print(f"   ⚠️ Failed to save raw email: {e}")
             return None
 
-    def _save_evaluated_email(self, subject, sender, body, category="", summary="", importance=""):
+    def _save_evaluated_email(self, subject, sender, body, category="", summary="", importance="", reused_from=""):
         """Saves evaluated email with processing results to nested folders: evaluated/category/priority/"""
         # Ensure we have valid category and importance values
         clean_category = category.strip() if category else "uncategorized"
@@ -120,6 +143,8 @@ class GmailMonitor:
                 f.write(f"Category: {category}\n")
                 f.write(f"Importance: {importance}\n")
                 f.write(f"Summary: {summary}\n")
+                if reused_from:
+                    f.write(f"Reused From: {reused_from}\n")
                 f.write(f"\n{'='*60}\n")
                 f.write(f"Original Message:\n{body}")
             print(f"   📊 Evaluated email saved to: {filepath}")
@@ -128,31 +153,155 @@ class GmailMonitor:
             print(f"   ⚠️ Failed to save evaluated email: {e}")
             return None
 
-    def _process_email(self, subject, sender, body):
+    def _get_gmail_thread_id(self, fetch_header):
+        """Extracts the X-GM-THRID value from a FETCH response header, if present"""
+        if isinstance(fetch_header, bytes):
+            fetch_header = fetch_header.decode(errors="ignore")
+        found = re.search(r"X-GM-THRID (\d+)", fetch_header or "")
+        return found.group(1) if found else None
+
+    def _get_arrival_time(self, fetch_header):
+        """Extracts INTERNALDATE (server arrival time) from a FETCH response header as epoch seconds"""
+        import imaplib
+        if isinstance(fetch_header, str):
+            fetch_header = fetch_header.encode()
+        arrival = imaplib.Internaldate2tuple(fetch_header or b"")
+        return time.mktime(arrival) if arrival else None
+
+    def _fetch_priority_headers(self, msg_ids):
+        """Fetches only the headers used for scheduling and thread grouping, for all new messages in one round trip"""
+        status, msg_data = self.mail.fetch(
+            b",".join(msg_ids),
+            '(X-GM-THRID BODY.PEEK[HEADER.FIELDS (FROM SUBJECT LIST-UNSUBSCRIBE PRECEDENCE '
+            'MESSAGE-ID IN-REPLY-TO REFERENCES)])'
+        )
+        parser = BytesHeaderParser()
+        headers_by_id = {}
+        for response_part in msg_data:
+            if isinstance(response_part, tuple):
+                msg_id = response_part[0].split()[0]
+                headers = parser.parsebytes(response_part[1])
+                headers_by_id[msg_id] = {
+                    key.lower(): str(make_header(decode_header(value))) for key, value in headers.items()
+                }
+                headers_by_id[msg_id]["x-gm-thrid"] = self._get_gmail_thread_id(response_part[0])
+        return headers_by_id
+
+    def _prioritize(self, new_ids):
+        """Orders new message ids so likely-important threads are processed first"""
+        try:
+            return self.scheduler.order(new_ids, self._fetch_priority_headers(sorted(new_ids, key=int)))
+        except Exception as e:
+            print(f"\n⚠️ Priority scheduling unavailable, using mailbox order: {e}")
+            return sorted(new_ids, key=int)
+
+    def _fetch_record(self, msg_id):
+        """Fetches one message and returns it as a compact EmailRecord.
+        
+        The raw RFC822 bytes only live inside this call, so they are freed
+        before the (slow) processing pipeline runs.
+        """
+        status, msg_data = self.mail.fetch(msg_id, '(X-GM-THRID INTERNALDATE RFC822)')
+        for response_part in msg_data:
+            if isinstance(response_part, tuple):
+                return EmailRecord.from_bytes(
+                    response_part[1], msg_id,
+                    gmail_thread_id=self._get_gmail_thread_id(response_part[0]),
+                    received_at=self._get_arrival_time(response_part[0])
+                )
+        return None
+
+    def _iter_new_records(self, new_ids):
+        """Yields new messages one at a time instead of holding them all in memory"""
+        for msg_id in new_ids:
+            record = self._fetch_record(msg_id)
+            if record is not None:
+                yield record
+
+    def _process_email(self, record, thread=None):
         """Complete email processing pipeline: Categorize -> Summarize -> Rate Importance"""
+        # Label constants only: importing the classes does not build the processors
+        from modules.categorizer import EmailCategorizer
+        from modules.importance import ImportanceRater
+        
+        subject, body = record.subject, record.body
         print(f"\n🔄 Processing email: {subject[:50]}...")
         
+        # Replies in a known thread only summarize their newly written content
+        is_reply = thread is not None and thread.has_history
+        content = (self.thread_tracker.strip_quoted(body) or body) if is_reply else body
+        if is_reply:
+            print(f"   🧵 Reply in known thread ({thread.message_count} earlier), "
+                  f"sending {len(content)}/{len(body)} chars")
+        
+        # Look for an already evaluated near-duplicate first (standalone emails only)
+        fingerprint = match = None
+        if not is_reply:
+            fingerprint = self.duplicate_index.fingerprint(subject, body)
+            if fingerprint is not None:
+                match = self.duplicate_index.lookup(fingerprint, email_id=subject)
+        
         # Step 1: Categorize
-        print("   📂 Categorizing...")
-        category_result = self.categorizer.categorize_single_email(body, email_id=subject)
-        category = category_result.get('category', 'Unknown')
+        if match:
+            print(f"   ♻️ Near-duplicate of '{match.email_id[:40]}' ({match.similarity:.0%} similar), reusing results")
+            category = match.category
+        elif is_reply and thread.category in EmailCategorizer.CATEGORIES:
+            # Replies stay in the thread's category; a quote-stripped "thanks!" says too little
+            print(f"   🧵 Reusing thread category: {thread.category}")
+            category = thread.category
+        else:
+            print("   📂 Categorizing...")
+            category_result = self.categorizer.categorize_single_email(body, email_id=subject)
+            category = category_result.get('category', 'Unknown')
+        
+        policy = self.policies.get_policy(category)
         
         # Step 2: Summarize
-        print("   📝 Summarizing...")
-        summary_result = self.summarizer.summarize_email(body, subject)
-        summary = summary_result.get('summary', 'Unable to summarize')
+        if match and match.summary:
+            summary = match.summary
+        elif policy.summarize and is_reply:
+            print("   📝 Updating thread summary...")
+            summary_result = self.summarizer.summarize_thread_update(thread.summary, content, subject, model=policy.model)
+            summary = summary_result.get('summary', thread.summary)
+        elif policy.summarize:
+            print("   📝 Summarizing...")
+            summary_result = self.summarizer.summarize_email(body, subject, model=policy.model)
+            summary = summary_result.get('summary', 'Unable to summarize')
+        else:
+            print(f"   ⏭️ Skipping summarization ({category} policy)")
+            summary = policy.fixed_summary
+            self.policies.record_skip(category)
         
         # Step 3: Rate importance
-        print("   ⭐ Rating importance...")
-        importance_result = self.importance_rater.rate_importance(summary, category, subject)
-        importance = importance_result.get('importance', 'unknown')
+        if match:
+            importance = match.importance
+        elif policy.rate_importance:
+            print("   ⭐ Rating importance...")
+            importance_result = self.importance_rater.rate_importance(summary, category, subject, model=policy.model)
+            importance = importance_result.get('importance', 'unknown')
+        else:
+            print(f"   ⏭️ Skipping importance rating ({category} policy)")
+            importance = policy.fixed_importance or "unknown"
+            self.policies.record_skip(category)
+        
+        # Only index clean results so API errors are never reused
+        if (fingerprint is not None and not match and category in EmailCategorizer.CATEGORIES
+                and importance in ImportanceRater.importance_scale):
+            self.duplicate_index.add(fingerprint, subject, category, importance, summary)
+        
+        # Keep the running thread summary for the next reply
+        if thread is not None and policy.summarize and not summary.startswith("Unable to generate summary"):
+            thread.update(summary, category, importance)
         
         # Display results
         print("   ✅ Processing complete!")
         print(f"   📂 Category: {category}")
         print(f"   ⭐ Importance: {importance.upper()}")
+        if self.policies.calls_saved:
+            print(f"   💰 LLM calls saved by category policies so far: {self.policies.calls_saved}")
         
-        return category, summary, importance
+        reused_from = f"{match.email_id} ({match.similarity:.0%} similar)" if match else ""
+        return category, summary, importance, reused_from
 
     def run(self):
         """Main loop to monitor emails."""
@@ -188,34 +337,31 @@ class GmailMonitor:
                 if new_ids:
                     print(f"\n🔔 New Mail Arrived! ({len(new_ids)} new)")
                     
-                    for msg_id in new_ids:
-                        status, msg_data = self.mail.fetch(msg_id, '(RFC822)')
+                    for record in self._iter_new_records(self._prioritize(new_ids)):
+                        thread = self.thread_tracker.resolve_thread(
+                            record.message_id,
+                            record.in_reply_to,
+                            record.references,
+                            record.gmail_thread_id
+                        )
+
+                        print("="*60)
+                        print(f"📧 FROM:    {record.sender}")
+                        print(f"📄 SUBJECT: {record.subject}")
+                        print("="*60)
+
+                        # First, save raw email
+                        self._save_raw_email(record.subject, record.sender, record.body)
+                        
+                        # Process through complete pipeline
+                        category, summary, importance, reused_from = self._process_email(record, thread)
+                        
+                        # Fast path: alert on urgent/critical mail before writing files
+                        self.notifier.notify(record, category, importance, summary)
                         
-                        for response_part in msg_data:
-                            if isinstance(response_part, tuple):
-                                msg = email.message_from_bytes(response_part[1])
-                                
-                                # Decode Subject
-                                subject, encoding = decode_header(msg["subject"])[0]
-                                if isinstance(subject, bytes):
-                                    subject = subject.decode(encoding if encoding else "utf-8")
-                                
-                                sender = msg.get("from")
-                                body = self._get_email_body(msg)
-
-                                print("="*60)
-                                print(f"📧 FROM:    {sender}")
-                                print(f"📄 SUBJECT: {subject}")
-                                print("="*60)
-
-                                # First, save raw email
-                                self._save_raw_email(subject, sender, body)
-                                
-                                # Process through complete pipeline
-                                category, summary, importance = self._process_email(subject, sender, body)
-                                
-                                # Save evaluated email with processing results
-                                self._save_evaluated_email(subject, sender, body, category, summary, importance)
+                        # Save evaluated email with processing results
+                        self._save_evaluated_email(record.subject, record.sender, record.body,
+                                                   category, summary, importance, reused_from)
 
                     # Update seen list
                     seen_ids = current_ids
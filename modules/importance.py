@@ -4,21 +4,22 @@ from utils.ai_prompts import AIPrompts
 
 
 class ImportanceRater(BaseAIProcessor):
+    importance_scale = ["low", "medium", "high", "urgent", "critical"]
+
     def __init__(self):
         super().__init__()
-        self.importance_scale = ["low", "medium", "high", "urgent", "critical"]
 
     def process(self, email_summary: str, category: str = "", subject: str = "") -> Dict:
         """Process email for importance rating"""
         return self.rate_importance(email_summary, category, subject)
         
-    def rate_importance(self, email_summary: str, category: str, subject: str = "") -> Dict:
+    def rate_importance(self, email_summary: str, category: str, subject: str = "", model: str = None) -> Dict:
         """
         Rates email importance on a 5-level scale: low -> medium -> high -> urgent -> critical
         """
         prompt = AIPrompts.importance_prompt(email_summary, category, subject)
         system_message = AIPrompts.get_system_message("importance")
-        raw_importance = self._make_api_request(prompt, system_message).lower()
+        raw_importance = self._make_label_request(prompt, system_message, self.importance_scale, model).lower()
         
         # Validate the response is one of our expected values
         if raw_importance in self.importance_scale:
@@ -0,0 +1,211 @@
+"""
+Near-duplicate detection for templated emails using SimHash fingerprints
+"""
+import hashlib
+import re
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# SimHash bit counting is done on a big integer holding one counter lane per
+# fingerprint bit; this table spreads the 8 bits of a byte into 8 lanes so each
+# feature costs 8 additions instead of 64
+_LANE_BITS = 32
+_SPREAD_TABLE = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+]
+
+
+class DuplicateMatch:
+    """Stored evaluation of an email that later near-duplicates can reuse"""
+
+    __slots__ = ("email_id", "fingerprint", "category", "importance", "summary", "similarity")
+
+    def __init__(self, email_id: str, fingerprint: int, category: str, importance: str,
+                 summary: str = "", similarity: float = 1.0):
+        self.email_id = email_id
+        self.fingerprint = fingerprint
+        self.category = category
+        self.importance = importance
+        self.summary = summary
+        self.similarity = similarity
+
+
+class NearDuplicateIndex:
+    """
+    Incremental SimHash index over normalized subjects and bodies.
+
+    Fingerprints are split into bands (LSH) so that any two fingerprints within
+    the allowed Hamming distance share at least one identical band, which keeps
+    lookups to a few dict probes instead of a scan over every stored email.
+
+    Every lookup appends a decision record to ``audit_log``, a bounded
+    in-memory deque that is not persisted. Reuses are also noted in the
+    evaluated email file ("Reused From").
+    """
+
+    FINGERPRINT_BITS = 64
+    DEFAULT_THRESHOLD = 0.9
+    # Bodies shorter than this (empty, HTML-only, one-liners) are too weak a
+    # signal: any two would look identical, so they are never fingerprinted
+    MIN_BODY_WORDS = 8
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, max_entries: int = 10000,
+                 reuse_summary: bool = False, audit_size: int = 1000):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.reuse_summary = reuse_summary
+        self.max_distance = int((1.0 - threshold) * self.FINGERPRINT_BITS)
+
+        # Pigeonhole: with max_distance + 1 bands, a match within max_distance
+        # bits must agree exactly on at least one band
+        self.num_bands = min(self.max_distance + 1, self.FINGERPRINT_BITS)
+        self.band_bits = self.FINGERPRINT_BITS // self.num_bands
+
+        self.entries: "OrderedDict[int, DuplicateMatch]" = OrderedDict()
+        self.bands: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+        self.audit_log = deque(maxlen=audit_size)
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Fingerprinting
+    # ------------------------------------------------------------------
+
+    # Template variables that change between otherwise identical emails
+    PROPER_NOUN = re.compile(r"(?<=[a-z,;:])(\s+)[A-Z][a-z]+\b")
+    DATE_WORDS = re.compile(
+        r"\b(jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|june?|july?|aug(ust)?|sep(t(ember)?)?"
+        r"|oct(ober)?|nov(ember)?|dec(ember)?|mon(day)?|tue(s(day)?)?|wed(nesday)?"
+        r"|thu(rs(day)?)?|fri(day)?|sat(urday)?|sun(day)?)\b"
+    )
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Mask volatile tokens (names, dates, numbers, emails, URLs) in templated mail"""
+        # Capitalized words mid-sentence are usually names ("Hi Alice, ...")
+        text = cls.PROPER_NOUN.sub(r"\1name", text)
+        text = text.lower()
+        text = re.sub(r"https?://\S+", " url ", text)
+        text = re.sub(r"[\w.+-]+@[\w-]+\.[\w.]+", " email ", text)
+        text = re.sub(r"\d+", "#", text)
+        text = cls.DATE_WORDS.sub("date", text)
+        text = re.sub(r"[^\w#\s]", " ", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def fingerprint(self, subject: str, body: str) -> Optional[int]:
+        """Compute a 64-bit SimHash over subject tokens and body word bigrams.
+        
+        Returns None when the body has fewer than MIN_BODY_WORDS words.
+        """
+        words = self.normalize(body or "").split()
+        if len(words) < self.MIN_BODY_WORDS:
+            return None
+        features = [f"s:{word}" for word in self.normalize(subject or "").split()]
+        features.extend(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+        # One lane accumulator per digest byte
+        c0 = c1 = c2 = c3 = c4 = c5 = c6 = c7 = 0
+        table = _SPREAD_TABLE
+        for feature in features:
+            b0, b1, b2, b3, b4, b5, b6, b7 = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            c0 += table[b0]
+            c1 += table[b1]
+            c2 += table[b2]
+            c3 += table[b3]
+            c4 += table[b4]
+            c5 += table[b5]
+            c6 += table[b6]
+            c7 += table[b7]
+
+        # A bit is set when more than half of the features have it set
+        lane_mask = (1 << _LANE_BITS) - 1
+        fingerprint = 0
+        for position, counts in enumerate((c0, c1, c2, c3, c4, c5, c6, c7)):
+            for bit in range(8):
+                if ((counts >> (bit * _LANE_BITS)) & lane_mask) * 2 > len(features):
+                    fingerprint |= 1 << (position * 8 + bit)
+        return fingerprint
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.num_bands)]
+
+    def similarity(self, a: int, b: int) -> float:
+        """Fraction of identical bits between two fingerprints"""
+        return 1.0 - bin(a ^ b).count("1") / self.FINGERPRINT_BITS
+
+    # ------------------------------------------------------------------
+    # Index operations
+    # ------------------------------------------------------------------
+
+    def lookup(self, fingerprint: int, email_id: str = "") -> Optional[DuplicateMatch]:
+        """Return the closest stored evaluation above the threshold, if any"""
+        best = None
+        best_similarity = self.threshold
+        candidates = set()
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            candidates.update(band.get(key, ()))
+
+        for candidate in candidates:
+            entry = self.entries[candidate]
+            score = self.similarity(fingerprint, entry.fingerprint)
+            if score >= best_similarity:
+                best, best_similarity = entry, score
+
+        if best:
+            self.hits += 1
+            match = DuplicateMatch(best.email_id, best.fingerprint, best.category,
+                                   best.importance, best.summary, best_similarity)
+        else:
+            self.misses += 1
+            match = None
+
+        self.audit_log.append({
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "email_id": email_id,
+            "fingerprint": f"{fingerprint:016x}",
+            "candidates": len(candidates),
+            "reused_from": best.email_id if best else None,
+            "similarity": round(best_similarity, 4) if best else None,
+            "decision": "reuse" if best else "evaluate"
+        })
+        return match
+
+    def add(self, fingerprint: int, email_id: str, category: str, importance: str, summary: str = ""):
+        """Store an evaluated email so future near-duplicates can reuse it"""
+        if fingerprint in self.entries:
+            self.entries.move_to_end(fingerprint)
+        else:
+            for band, key in zip(self.bands, self._band_keys(fingerprint)):
+                band.setdefault(key, []).append(fingerprint)
+        self.entries[fingerprint] = DuplicateMatch(
+            email_id, fingerprint, category, importance, summary if self.reuse_summary else ""
+        )
+
+        while len(self.entries) > self.max_entries:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        fingerprint, _ = self.entries.popitem(last=False)
+        for band, key in zip(self.bands, self._band_keys(fingerprint)):
+            bucket = band.get(key)
+            if bucket:
+                bucket.remove(fingerprint)
+                if not bucket:
+                    del band[key]
+
+    def get_stats(self) -> Dict:
+        """Return index size and hit/miss counters"""
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "threshold": self.threshold,
+            "max_distance": self.max_distance
+        }
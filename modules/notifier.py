@@ -0,0 +1,102 @@
+"""
+Low-latency local notifications for urgent and critical mail
+
+Channel modules (threading, subprocess, socket) are imported on first use
+to keep startup cheap.
+"""
+import json
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+
+class UrgentNotifier:
+    """
+    Sends an alert through any configured channel (webhook, command, Unix
+    socket) as soon as an email is rated urgent/critical, and measures the
+    time-to-alert from the message's IMAP arrival.
+    """
+
+    def __init__(self, webhook_url: Optional[str] = None, command: Optional[str] = None,
+                 socket_path: Optional[str] = None, levels: Iterable[str] = ("urgent", "critical"),
+                 history_size: int = 1000):
+        self.webhook_url = webhook_url
+        self.command = command
+        self.socket_path = socket_path
+        self.levels = {level.lower() for level in levels}
+        self.latencies = deque(maxlen=history_size)
+        self.alerts_sent = 0
+
+    def should_notify(self, importance: str) -> bool:
+        """True for importance levels that trigger an alert"""
+        return (importance or "").strip().lower() in self.levels
+
+    def notify(self, record, category: str, importance: str, summary: str = "") -> Optional[float]:
+        """Alert on urgent mail; returns time-to-alert in seconds (None if not sent)"""
+        if not self.should_notify(importance):
+            return None
+
+        time_to_alert = time.time() - record.received_at if record.received_at else None
+        payload = {
+            "subject": record.subject,
+            "sender": record.sender,
+            "category": category,
+            "importance": importance,
+            "summary": summary,
+            "received_at": record.received_at,
+            "time_to_alert": time_to_alert
+        }
+
+        print(f"   🚨 {importance.upper()} mail from {record.sender}: {record.subject[:50]}")
+        if self.webhook_url:
+            # Don't block the pipeline on a slow endpoint
+            import threading
+            threading.Thread(target=self._send_webhook, args=(payload,), daemon=True).start()
+        if self.command:
+            self._run_command(payload)
+        if self.socket_path:
+            self._send_socket(payload)
+
+        self.alerts_sent += 1
+        if time_to_alert is not None:
+            self.latencies.append(time_to_alert)
+            print(f"   ⏱️ Time-to-alert: {time_to_alert:.1f}s since arrival")
+        return time_to_alert
+
+    def _send_webhook(self, payload: Dict):
+        try:
+            import requests
+            requests.post(self.webhook_url, json=payload, timeout=5)
+        except Exception as e:
+            print(f"   ⚠️ Webhook notification failed: {e}")
+
+    def _run_command(self, payload: Dict):
+        """Start the command without waiting; the alert JSON is passed on stdin"""
+        try:
+            import subprocess
+            process = subprocess.Popen(self.command, shell=True, stdin=subprocess.PIPE)
+            process.stdin.write(json.dumps(payload).encode("utf-8"))
+            process.stdin.close()
+        except Exception as e:
+            print(f"   ⚠️ Command notification failed: {e}")
+
+    def _send_socket(self, payload: Dict):
+        """Send one JSON line to a local Unix socket listener"""
+        try:
+            import socket
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(1)
+                client.connect(self.socket_path)
+                client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        except Exception as e:
+            print(f"   ⚠️ Socket notification failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """Return alert count and time-to-alert statistics (seconds)"""
+        latencies = sorted(self.latencies)
+        return {
+            "alerts_sent": self.alerts_sent,
+            "avg_time_to_alert": sum(latencies) / len(latencies) if latencies else None,
+            "p95_time_to_alert": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+            "max_time_to_alert": latencies[-1] if latencies else None
+        }
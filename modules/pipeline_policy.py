@@ -0,0 +1,67 @@
+"""
+Per-category pipeline policies to skip or cheapen LLM stages after categorization
+"""
+from typing import Dict, Optional
+
+
+class CategoryPolicy:
+    """Describes how the pipeline treats emails of a single category"""
+
+    def __init__(self, summarize: bool = True, rate_importance: bool = True,
+                 fixed_importance: Optional[str] = None, fixed_summary: str = "",
+                 model: Optional[str] = None):
+        self.summarize = summarize
+        self.rate_importance = rate_importance
+        self.fixed_importance = fixed_importance
+        self.fixed_summary = fixed_summary
+        self.model = model  # Optional cheaper model for the remaining stages
+
+    def __repr__(self):
+        return (f"CategoryPolicy(summarize={self.summarize}, rate_importance={self.rate_importance}, "
+                f"fixed_importance={self.fixed_importance!r}, model={self.model!r})")
+
+
+class PipelinePolicies:
+    """Registry of category policies plus counters for LLM calls saved"""
+
+    @staticmethod
+    def _default_policies() -> Dict[str, CategoryPolicy]:
+        """Build fresh default policies so instances never share mutable policy objects"""
+        return {
+            "Spam": CategoryPolicy(
+                summarize=False,
+                rate_importance=False,
+                fixed_importance="low",
+                fixed_summary="Skipped: email categorized as Spam"
+            ),
+            "Promotion": CategoryPolicy(
+                rate_importance=False,
+                fixed_importance="low"
+            ),
+        }
+
+    def __init__(self, policies: Optional[Dict[str, CategoryPolicy]] = None):
+        self.policies = self._default_policies() if policies is None else dict(policies)
+        self.default_policy = CategoryPolicy()
+        self.calls_saved = 0
+        self.saved_by_category: Dict[str, int] = {}
+
+    def set_policy(self, category: str, policy: CategoryPolicy):
+        """Register or replace the policy for a category"""
+        self.policies[category] = policy
+
+    def get_policy(self, category: str) -> CategoryPolicy:
+        """Return the policy for a category, falling back to the full pipeline"""
+        return self.policies.get(category, self.default_policy)
+
+    def record_skip(self, category: str, calls: int = 1):
+        """Count LLM calls avoided because of a category policy"""
+        self.calls_saved += calls
+        self.saved_by_category[category] = self.saved_by_category.get(category, 0) + calls
+
+    def get_stats(self) -> Dict:
+        """Return counters describing how many LLM calls were saved"""
+        return {
+            "calls_saved": self.calls_saved,
+            "by_category": dict(self.saved_by_category)
+        }
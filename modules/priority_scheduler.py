@@ -0,0 +1,87 @@
+"""
+Orders new mail so likely-important messages are processed first
+"""
+import re
+from email.utils import parseaddr
+from typing import Dict, Iterable, List, Optional
+
+
+class PriorityScheduler:
+    """Scores messages from cheap header signals only (no body, no LLM calls)"""
+
+    DEFAULT_KEYWORDS = [
+        "urgent", "critical", "security", "alert", "breach", "outage", "down",
+        "incident", "asap", "immediately", "action required", "password", "overdue"
+    ]
+
+    def __init__(self, sender_allowlist: Optional[Iterable[str]] = None,
+                 subject_keywords: Optional[Iterable[str]] = None):
+        # Entries may be full addresses (boss@company.com) or domains (company.com)
+        self.sender_allowlist = {entry.strip().lower() for entry in (sender_allowlist or []) if entry.strip()}
+        keywords = subject_keywords if subject_keywords is not None else self.DEFAULT_KEYWORDS
+        self.keyword_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b", re.IGNORECASE
+        ) if keywords else None
+
+    def score(self, headers: Dict[str, str]) -> int:
+        """Higher scores are processed first; bulk mail scores below zero"""
+        score = 0
+
+        address = parseaddr(headers.get("from") or "")[1].lower()
+        domain = address.rpartition("@")[2]
+        if address and (address in self.sender_allowlist or domain in self.sender_allowlist):
+            score += 50
+
+        if self.keyword_pattern and self.keyword_pattern.search(headers.get("subject") or ""):
+            score += 30
+
+        if headers.get("list-unsubscribe"):
+            score -= 40
+        if (headers.get("precedence") or "").strip().lower() in ("bulk", "list", "junk"):
+            score -= 20
+
+        return score
+
+    @staticmethod
+    def group_threads(msg_ids: Iterable[bytes], headers_by_id: Dict[bytes, Dict[str, str]]) -> List[List[bytes]]:
+        """
+        Group ids into conversations via X-GM-THRID and Message-ID /
+        In-Reply-To / References, each group in mailbox order
+        """
+        parent: Dict[str, str] = {}
+
+        def find(key):
+            while parent.setdefault(key, key) != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        roots = {}
+        for msg_id in msg_ids:
+            headers = headers_by_id.get(msg_id, {})
+            keys = [f"msg:{msg_id.decode()}"] + re.findall(
+                r"<[^<>\s]+>",
+                " ".join(headers.get(name) or "" for name in ("message-id", "in-reply-to", "references"))
+            )
+            if headers.get("x-gm-thrid"):
+                keys.append(f"gm:{headers['x-gm-thrid']}")
+            for key in keys[1:]:
+                parent[find(key)] = find(keys[0])
+            roots[msg_id] = keys[0]
+
+        groups: Dict[str, List[bytes]] = {}
+        for msg_id in sorted(roots, key=int):
+            groups.setdefault(find(roots[msg_id]), []).append(msg_id)
+        return list(groups.values())
+
+    def order(self, msg_ids: Iterable[bytes], headers_by_id: Dict[bytes, Dict[str, str]]) -> List[bytes]:
+        """
+        Sort whole threads by their best score (mailbox order for ties) and
+        keep mailbox order inside each thread, so a prioritized reply never
+        runs before the message it answers
+        """
+        threads = self.group_threads(msg_ids, headers_by_id)
+        threads.sort(key=lambda thread: (
+            -max(self.score(headers_by_id.get(msg_id, {})) for msg_id in thread), int(thread[0])
+        ))
+        return [msg_id for thread in threads for msg_id in thread]
@@ -11,19 +11,37 @@ class EmailSummarizer(BaseAIProcessor):
         """Process email for summarization"""
         return self.summarize_email(email_content, subject)
         
-    def summarize_email(self, email_content: str, subject: str = "") -> Dict:
+    def summarize_email(self, email_content: str, subject: str = "", model: str = None) -> Dict:
         """
         Summarizes an email to extract only necessary information
         """
         prompt = AIPrompts.summarizer_prompt(email_content, subject)
         system_message = AIPrompts.get_system_message("summarizer")
-        summary = self._make_api_request(prompt, system_message)
+        summary = self._make_api_request(prompt, system_message, model)
         
         if summary.startswith(("API Error", "Request Failed", "No response")):
             summary = f"Unable to generate summary: {summary}"
 
         return {
             "subject": subject,
-            "original_content": email_content,
             "summary": summary
-        }
\ No newline at end of file
+        }
+        
+    def summarize_thread_update(self, previous_summary: str, new_content: str, subject: str = "",
+                                model: str = None) -> Dict:
+        """
+        Merges only the new content of a reply into the running thread summary
+        """
+        prompt = AIPrompts.thread_summary_prompt(previous_summary, new_content, subject)
+        system_message = AIPrompts.get_system_message("summarizer")
+        summary = self._make_api_request(prompt, system_message, model)
+        
+        if summary.startswith(("API Error", "Request Failed", "No response")):
+            # Keep the previous running summary rather than losing the thread context
+            summary = previous_summary
+
+        return {
+            "subject": subject,
+            "previous_summary": previous_summary,
+            "summary": summary
+        }
@@ -0,0 +1,113 @@
+"""
+Conversation tracking so replies are summarized incrementally instead of from scratch
+"""
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class ThreadState:
+    """Running state of a single email conversation"""
+
+    def __init__(self, thread_id: str):
+        self.thread_id = thread_id
+        self.message_ids: List[str] = []
+        self.summary = ""
+        self.importance = ""
+        self.category = ""
+        self.message_count = 0
+
+    @property
+    def has_history(self) -> bool:
+        """True once at least one message of the thread has been summarized"""
+        return bool(self.summary)
+
+    def update(self, summary: str, category: str, importance: str):
+        """Store the latest running summary and rating for the thread"""
+        self.summary = summary
+        self.category = category
+        self.importance = importance
+        self.message_count += 1
+
+
+class ThreadTracker:
+    """
+    Groups messages into threads using Message-ID / In-Reply-To / References
+    headers, or the Gmail thread ID when the server provides one.
+    """
+
+    QUOTE_MARKERS = [
+        re.compile(r"^On\b[^\n]*(\n[^\n]*)?wrote:\s*$", re.MULTILINE),
+        re.compile(r"^-+\s*Original Message\s*-+\s*$", re.MULTILINE | re.IGNORECASE),
+        re.compile(r"^_{20,}\s*$", re.MULTILINE),
+    ]
+
+    def __init__(self, max_threads: int = 5000):
+        self.max_threads = max_threads
+        self.threads: "OrderedDict[str, ThreadState]" = OrderedDict()
+        self.message_index: Dict[str, str] = {}  # message/alias id -> thread id
+        self._local_ids = 0  # only grows, so fallback keys stay unique after eviction
+
+    @staticmethod
+    def _parse_ids(header_value: Optional[str]) -> List[str]:
+        """Extract <message-id> tokens from a header value"""
+        if not header_value:
+            return []
+        return re.findall(r"<[^<>\s]+>", str(header_value))
+
+    def resolve_thread(self, message_id: Optional[str] = None, in_reply_to: Optional[str] = None,
+                       references: Optional[str] = None, gmail_thread_id: Optional[str] = None) -> ThreadState:
+        """Return the thread a message belongs to, creating a new one if needed"""
+        own_ids = self._parse_ids(message_id)
+        related_ids = self._parse_ids(references) + self._parse_ids(in_reply_to)
+        gmail_key = f"gm:{gmail_thread_id}" if gmail_thread_id else None
+
+        thread_id = None
+        for candidate in ([gmail_key] if gmail_key else []) + related_ids[::-1] + own_ids:
+            if candidate in self.message_index:
+                thread_id = self.message_index[candidate]
+                break
+
+        if thread_id is None:
+            thread_id = gmail_key or (related_ids[0] if related_ids else None) \
+                or (own_ids[0] if own_ids else None)
+            if thread_id is None:
+                self._local_ids += 1
+                thread_id = f"local:{self._local_ids}"
+            self.threads[thread_id] = ThreadState(thread_id)
+
+        thread = self.threads[thread_id]
+        self.threads.move_to_end(thread_id)
+
+        for alias in ([gmail_key] if gmail_key else []) + own_ids + related_ids:
+            if alias not in self.message_index:
+                self.message_index[alias] = thread_id
+                thread.message_ids.append(alias)
+
+        while len(self.threads) > self.max_threads:
+            self._evict_oldest()
+        return thread
+
+    def _evict_oldest(self):
+        _, thread = self.threads.popitem(last=False)
+        for alias in thread.message_ids:
+            self.message_index.pop(alias, None)
+
+    @classmethod
+    def strip_quoted(cls, body: str) -> str:
+        """Remove quoted reply history, keeping only the newly written content"""
+        cut = len(body)
+        for marker in cls.QUOTE_MARKERS:
+            found = marker.search(body)
+            if found:
+                cut = min(cut, found.start())
+
+        lines = [line for line in body[:cut].splitlines() if not line.lstrip().startswith(">")]
+        return "\n".join(lines).strip()
+
+    def get_stats(self) -> Dict:
+        """Return the number of tracked threads and message ids"""
+        return {
+            "threads": len(self.threads),
+            "message_ids": len(self.message_index)
+        }
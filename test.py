@@ -9,9 +9,18 @@ This script allows you to test individual components of the mail processing pipe
 
 import sys
 import os
+import json
+import time
 from modules.categorizer import EmailCategorizer
 from modules.summarizer import EmailSummarizer
 from modules.importance import ImportanceRater
+from modules.pipeline_policy import PipelinePolicies
+from modules.near_duplicate import NearDuplicateIndex
+from modules.thread_tracker import ThreadTracker
+from utils.ai_prompts import AIPrompts
+from modules.priority_scheduler import PriorityScheduler
+from modules.notifier import UrgentNotifier
+from modules.email_record import EmailRecord
 
 def test_categorizer():
     """Test the email categorizer"""
@@ -109,6 +118,192 @@ def test_full_pipeline():
     print(f"   ⭐ Importance: {importance_result['importance'].upper()}")
     print(f"   📊 Scale: {importance_result['scale']}")
 
+class FakeResponse:
+    """Canned API response: SSE lines when chunks are given, else a JSON body"""
+    
+    def __init__(self, chunks=None, body=None):
+        self.chunks = chunks
+        self.body = body
+        self.lines_read = 0
+        self.headers = {"Content-Type": "text/event-stream" if chunks is not None else "application/json"}
+    
+    def iter_lines(self, decode_unicode=True):
+        for chunk in self.chunks:
+            self.lines_read += 1
+            yield "data: " + json.dumps(chunk if isinstance(chunk, dict) else {"choices": [{"delta": {"content": chunk}}]})
+        self.lines_read += 1
+        yield "data: [DONE]"
+    
+    def json(self):
+        return self.body
+    
+    def close(self):
+        pass
+
+class FakeSession:
+    """Stands in for requests.Session so label requests run offline"""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def post(self, url, **kwargs):
+        return self.response
+
+def test_pipeline_policies():
+    """Test per-category pipeline policies (no API calls)"""
+    print("\n🧪 Testing Pipeline Policies...")
+    policies = PipelinePolicies()
+    
+    for category in ["Spam", "Promotion", "Work"]:
+        policy = policies.get_policy(category)
+        print(f"   {category}: {policy}")
+    
+    spam_policy = policies.get_policy("Spam")
+    assert not spam_policy.summarize and spam_policy.fixed_importance == "low"
+    assert policies.get_policy("Work").summarize
+    
+    policies.record_skip("Spam", calls=2)
+    print(f"   Stats: {policies.get_stats()}")
+    return policies
+
+def test_near_duplicate_index():
+    """Test near-duplicate reuse for templated emails (no API calls)"""
+    print("\n🧪 Testing Near-Duplicate Index...")
+    # Same threshold the Gmail Monitor uses
+    index = NearDuplicateIndex(threshold=NearDuplicateIndex.DEFAULT_THRESHOLD)
+    
+    template = """
+    Hi {name}, your order #{order} has shipped and will arrive on {date}.
+    Track your package in your account dashboard. Thanks for shopping with
+    ExampleStore, we appreciate your business and hope to see you again soon.
+    """
+    first = index.fingerprint("Your order 1001 shipped", template.format(name="Alice", order=1001, date="March 3"))
+    second = index.fingerprint("Your order 2002 shipped", template.format(name="Bob", order=2002, date="April 19"))
+    unrelated = index.fingerprint("Quarterly Review", "Can we move our quarterly review to Wednesday afternoon?")
+    
+    index.add(first, "order_1001", "Promotion", "low")
+    match = index.lookup(second, "order_2002")
+    assert match is not None and match.category == "Promotion"
+    assert index.lookup(unrelated, "quarterly_review") is None
+    
+    # Empty or HTML-only bodies would all look alike: never fingerprinted
+    assert index.fingerprint("Security alert", "") is None
+    assert index.fingerprint("Your receipt", "See attached.") is None
+    
+    print(f"   Reused from: {match.email_id} ({match.similarity:.0%} similar)")
+    print(f"   Stats: {index.get_stats()}")
+    return index
+
+def test_thread_tracker():
+    """Test thread grouping and quote stripping (no API calls)"""
+    print("\n🧪 Testing Thread Tracker...")
+    tracker = ThreadTracker()
+    
+    first = tracker.resolve_thread("<plan-1@company.com>")
+    reply = tracker.resolve_thread("<plan-2@company.com>", "<plan-1@company.com>", "<plan-1@company.com>")
+    assert first is reply
+    
+    # Messages without any ids must never share a fallback thread
+    assert tracker.resolve_thread() is not tracker.resolve_thread()
+    
+    reply_body = """Tuesday at 10am works for me.
+
+On Mon, Jan 5, 2026 at 9:00 AM Sarah <manager@company.com> wrote:
+> I'd like to schedule a meeting for our quarterly review next week.
+"""
+    new_content = tracker.strip_quoted(reply_body)
+    assert new_content == "Tuesday at 10am works for me."
+    
+    print(f"   New content: {new_content}")
+    print(f"   Stats: {tracker.get_stats()}")
+    return tracker
+
+def test_prompt_templates():
+    """Test that prompts share a byte-identical static prefix (no API calls)"""
+    print("\n🧪 Testing Prompt Templates...")
+    categories = ["Promotion", "Spam", "Work", "Personal", "Finance", "Other"]
+    template = AIPrompts.categorizer_template(categories)
+    
+    first = AIPrompts.categorizer_prompt("Weekly newsletter", categories)
+    second = AIPrompts.categorizer_prompt("Server down, please help", categories)
+    assert first.startswith(template.static_prefix) and second.startswith(template.static_prefix)
+    
+    for name, stats in AIPrompts.get_prompt_stats().items():
+        print(f"   {name}: {stats}")
+    return template
+
+def test_priority_scheduler():
+    """Test header-based processing order (no API calls)"""
+    print("\n🧪 Testing Priority Scheduler...")
+    scheduler = PriorityScheduler(sender_allowlist=["manager@company.com", "bank.com"])
+    
+    headers_by_id = {
+        b"1": {"from": "News <news@shop.com>", "subject": "Big sale", "list-unsubscribe": "<mailto:u@shop.com>"},
+        b"2": {"from": "friend@mail.com", "subject": "Lunch?"},
+        b"3": {"from": "Security <security@bank.com>", "subject": "Security alert"},
+        b"4": {"from": "manager@company.com", "subject": "Quarterly Review"},
+    }
+    order = scheduler.order(headers_by_id.keys(), headers_by_id)
+    assert order == [b"3", b"4", b"2", b"1"]
+    
+    # A prioritized reply lifts its whole thread but still runs after the parent
+    headers_by_id[b"5"] = {"from": "dev@company.com", "subject": "Release", "message-id": "<rel-1@company.com>"}
+    headers_by_id[b"6"] = {"from": "manager@company.com", "subject": "Re: Release",
+                           "in-reply-to": "<rel-1@company.com>", "references": "<rel-1@company.com>"}
+    headers_by_id[b"7"] = {"from": "friend@mail.com", "subject": "Photos", "x-gm-thrid": "42"}
+    headers_by_id[b"8"] = {"from": "Security <security@bank.com>", "subject": "Re: Photos", "x-gm-thrid": "42"}
+    order = scheduler.order(headers_by_id.keys(), headers_by_id)
+    assert order == [b"3", b"4", b"5", b"6", b"7", b"8", b"2", b"1"]
+    
+    print(f"   Processing order: {[msg_id.decode() for msg_id in order]}")
+    return order
+
+def test_label_streaming():
+    """Test streamed label parsing and early termination (no API calls)"""
+    print("\n🧪 Testing Label Streaming...")
+    rater = ImportanceRater()
+    labels = rater.importance_scale
+    
+    def label_for(response):
+        rater._session = FakeSession(response)
+        return rater._make_label_request("prompt", "system", labels)
+    
+    # A leading label ends the stream without reading the rest
+    response = FakeResponse(["Urgent", ", the server", " is down"])
+    assert label_for(response) == "urgent" and response.lines_read == 2
+    
+    # Labels split across chunks and hedged replies are read to the end
+    assert label_for(FakeResponse(["Cri", "tical"])) == "critical"
+    assert label_for(FakeResponse(["Not", " urgent", ", just", " low"])) == "low"
+    
+    # Backend ignoring "stream", error chunks and empty streams
+    assert label_for(FakeResponse(body={"choices": [{"message": {"content": "High"}}]})) == "high"
+    assert label_for(FakeResponse([{"error": {"message": "rate limited"}}])) == "API Error: rate limited"
+    assert label_for(FakeResponse([])) == "No response from API"
+    
+    print("   Leading, split, hedged, JSON, error and empty replies handled")
+    return rater
+
+def test_urgent_notifier():
+    """Test alert levels and time-to-alert stats with no channels configured (no API calls)"""
+    print("\n🧪 Testing Urgent Notifier...")
+    notifier = UrgentNotifier()
+    assert notifier.should_notify(" Critical ") and not notifier.should_notify("high")
+    
+    record = EmailRecord("Server down", "ops@company.com", "The API is down.", received_at=time.time() - 30)
+    assert notifier.notify(record, "Work", "medium") is None
+    
+    latencies = [notifier.notify(record, "Work", "urgent") for _ in range(20)]
+    assert all(30 <= latency < 40 for latency in latencies)
+    
+    stats = notifier.get_stats()
+    assert stats["alerts_sent"] == 20
+    assert stats["p95_time_to_alert"] == sorted(latencies)[19]
+    assert stats["avg_time_to_alert"] <= stats["p95_time_to_alert"] <= stats["max_time_to_alert"]
+    
+    print(f"   Stats: {stats}")
+    return notifier
+
 def main():
     """Run all tests"""
     print("🧪 Mail Flow Manager - Component Tests")
@@ -119,6 +314,13 @@ def main():
         test_summarizer()  
         test_importance_rater()
         test_full_pipeline()
+        test_pipeline_policies()
+        test_near_duplicate_index()
+        test_thread_tracker()
+        test_prompt_templates()
+        test_priority_scheduler()
+        test_label_streaming()
+        test_urgent_notifier()
         
         print("\n✅ All tests completed!")
         print("\nTo run the full mail monitor: python main.py")
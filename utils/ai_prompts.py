@@ -9,6 +9,41 @@ Author: Sipxi
 """
 
 
+class PromptTemplate:
+    """
+    A prompt compiled once into a fixed static prefix and a small variable section.
+    
+    Rendering only formats the variable section and appends it to the prefix,
+    so the prefix stays byte-identical between calls.
+    """
+    
+    # Optional callable(name, static_chars, variable_chars) invoked on every render
+    stats_hook = None
+    registry = []
+    
+    def __init__(self, name: str, static_prefix: str, variable_template: str):
+        self.name = name
+        self.static_prefix = static_prefix
+        self.variable_template = variable_template
+        self.renders = 0
+        self.variable_chars = 0
+        PromptTemplate.registry.append(self)
+    
+    def render(self, **fields) -> str:
+        """
+        Fill the variable section and append it to the static prefix.
+        
+        Returns:
+            str: Complete prompt text
+        """
+        variable = self.variable_template.format(**fields)
+        self.renders += 1
+        self.variable_chars += len(variable)
+        if PromptTemplate.stats_hook:
+            PromptTemplate.stats_hook(self.name, len(self.static_prefix), len(variable))
+        return self.static_prefix + variable
+
+
 class AIPrompts:
     """
     Container class for all AI prompts used in the email processing pipeline.
@@ -30,50 +65,154 @@ class AIPrompts:
         "low, medium, high, urgent, critical."
     )
     
+    # ============================================================================
+    # PROMPT TEMPLATES - Static instructions first, variable email data last
+    # ============================================================================
+    #
+    # Every template is compiled once. Its static prefix (instructions, scale,
+    # guidelines) is byte-identical across calls and comes before anything
+    # email-specific, so OpenAI-compatible servers can reuse their prefix cache.
+    
+    SEPARATOR = '-' * 60
+    
+    CATEGORIZER_GUIDELINES = """CLASSIFICATION GUIDELINES:
+• Promotional content → Promotion  
+• Suspicious/unwanted content → Spam
+• Business/professional content → Work
+• Personal communications → Personal
+• Banking/financial content → Finance
+• Everything else → Other"""
+    
+    SUMMARIZER_TEMPLATE = PromptTemplate(
+        "summarizer",
+        """You are an email summarizer. Extract only the essential information from the email below.
+
+SUMMARY REQUIREMENTS:
+Create a brief, natural summary in 2-3 sentences that covers:
+• What the sender wants or needs
+• Key details like dates, names, deadlines, or important information  
+• Any urgency or next steps required
+
+FORMATTING GUIDELINES:
+• Write in plain language without bullet points, numbered lists, or asterisks
+• Keep it conversational and easy to read
+• Focus on actionable information only
+
+TASK: Provide a clear, concise summary following the above guidelines.
+
+""",
+        "EMAIL DETAILS:\nSubject: {subject}\n\nEMAIL CONTENT:\n" + SEPARATOR + "\n{email_content}\n" + SEPARATOR
+    )
+    
+    THREAD_SUMMARY_TEMPLATE = PromptTemplate(
+        "thread_summary",
+        """You are an email summarizer. Update the running summary of an email conversation with its latest reply.
+
+SUMMARY REQUIREMENTS:
+Create a brief, natural summary in 2-3 sentences of the whole conversation that covers:
+• The current state of the discussion and what is being asked now
+• Key details like dates, names, deadlines, or important information  
+• Any urgency or next steps required
+
+FORMATTING GUIDELINES:
+• Write in plain language without bullet points, numbered lists, or asterisks
+• Prefer the newest information when it changes earlier details
+• Focus on actionable information only
+
+TASK: Provide the updated conversation summary following the above guidelines.
+
+""",
+        "EMAIL DETAILS:\nSubject: {subject}\n\nCONVERSATION SUMMARY SO FAR:\n" + SEPARATOR
+        + "\n{previous_summary}\n" + SEPARATOR + "\n\nNEW REPLY:\n" + SEPARATOR + "\n{new_content}\n" + SEPARATOR
+    )
+    
+    IMPORTANCE_TEMPLATE = PromptTemplate(
+        "importance",
+        """You are an email importance analyzer. Rate the importance of the email below.
+
+IMPORTANCE SCALE:
+• LOW: Routine emails, newsletters, non-urgent notifications, general information, social updates
+• MEDIUM: Regular work communications, meeting requests, follow-ups, planned tasks, non-urgent updates  
+• HIGH: Important business matters, time-sensitive requests, deadline reminders, significant decisions needed
+• URGENT: Critical deadlines (within 24-48 hours), important client issues, system problems, immediate action required
+• CRITICAL: Emergency situations, security alerts, system failures, legal issues, CEO-level communications, immediate crisis response needed
+
+EVALUATION CRITERIA:
+1. Time sensitivity and deadlines (immediate, hours, days, weeks)
+2. Business impact (revenue, operations, reputation)
+3. Action urgency required from recipient
+4. Sender's authority/position in organization
+5. Consequences of delay (minor inconvenience vs major business impact)
+6. Security or legal implications
+
+TASK: Rate this email's importance using the scale above.
+
+RESPONSE: Respond with ONLY one word: low, medium, high, urgent, or critical
+
+""",
+        "EMAIL DETAILS:\nSubject: {subject}\nCategory: {category}\n\nEMAIL SUMMARY:\n" + SEPARATOR
+        + "\n{email_summary}\n" + SEPARATOR
+    )
+    
+    _categorizer_templates = {}
+    
     # ============================================================================
     # EMAIL CATEGORIZATION PROMPTS
     # ============================================================================
     
-    @staticmethod
-    def categorizer_prompt(email_content: str, categories: list) -> str:
+    @classmethod
+    def categorizer_template(cls, categories: list) -> "PromptTemplate":
         """
-        Generate categorization prompt for email classification.
+        Get the compiled categorization template for a list of categories.
         
         Args:
-            email_content (str): The content of the email to classify
             categories (list): List of available categories for classification
             
         Returns:
-            str: Formatted prompt for email categorization
+            PromptTemplate: Template compiled once per distinct category list
         """
-        return f"""You are an email classification system.
+        key = tuple(categories)
+        template = cls._categorizer_templates.get(key)
+        if template is None:
+            template = PromptTemplate(
+                "categorizer",
+                f"""You are an email classification system.
 
 AVAILABLE CATEGORIES:
 {', '.join(categories)}
 
-EMAIL CONTENT:
-{'-' * 60}
-{email_content}
-{'-' * 60}
+{cls.CATEGORIZER_GUIDELINES}
 
-CLASSIFICATION GUIDELINES:
-• Promotional content → Promotion  
-• Suspicious/unwanted content → Spam
-• Business/professional content → Work
-• Personal communications → Personal
-• Banking/financial content → Finance
-• Everything else → Other
+TASK: Analyze the email content below and classify it into ONE of the categories above.
 
-TASK: Analyze the email content and classify it into ONE of the categories above.
+RESPONSE: Respond with ONLY the category name.
 
-RESPONSE: Respond with ONLY the category name."""
+""",
+                "EMAIL CONTENT:\n" + cls.SEPARATOR + "\n{email_content}\n" + cls.SEPARATOR
+            )
+            cls._categorizer_templates[key] = template
+        return template
+    
+    @classmethod
+    def categorizer_prompt(cls, email_content: str, categories: list) -> str:
+        """
+        Generate categorization prompt for email classification.
+        
+        Args:
+            email_content (str): The content of the email to classify
+            categories (list): List of available categories for classification
+            
+        Returns:
+            str: Formatted prompt for email categorization
+        """
+        return cls.categorizer_template(categories).render(email_content=email_content)
 
     # ============================================================================
     # EMAIL SUMMARIZATION PROMPTS
     # ============================================================================
     
-    @staticmethod
-    def summarizer_prompt(email_content: str, subject: str = "") -> str:
+    @classmethod
+    def summarizer_prompt(cls, email_content: str, subject: str = "") -> str:
         """
         Generate summarization prompt for extracting key information.
         
@@ -84,35 +223,31 @@ RESPONSE: Respond with ONLY the category name."""
         Returns:
             str: Formatted prompt for email summarization
         """
-        return f"""You are an email summarizer. Extract only the essential information from this email.
-
-EMAIL DETAILS:
-Subject: {subject if subject else 'N/A'}
-
-EMAIL CONTENT:
-{'-' * 60}
-{email_content}
-{'-' * 60}
-
-SUMMARY REQUIREMENTS:
-Create a brief, natural summary in 2-3 sentences that covers:
-• What the sender wants or needs
-• Key details like dates, names, deadlines, or important information  
-• Any urgency or next steps required
-
-FORMATTING GUIDELINES:
-• Write in plain language without bullet points, numbered lists, or asterisks
-• Keep it conversational and easy to read
-• Focus on actionable information only
+        return cls.SUMMARIZER_TEMPLATE.render(subject=subject or 'N/A', email_content=email_content)
 
-TASK: Provide a clear, concise summary following the above guidelines."""
+    @classmethod
+    def thread_summary_prompt(cls, previous_summary: str, new_content: str, subject: str = "") -> str:
+        """
+        Generate prompt for merging a new reply into a running thread summary.
+        
+        Args:
+            previous_summary (str): Running summary of the conversation so far
+            new_content (str): Newly written content of the reply (quotes removed)
+            subject (str): The subject line of the email
+            
+        Returns:
+            str: Formatted prompt for incremental thread summarization
+        """
+        return cls.THREAD_SUMMARY_TEMPLATE.render(
+            subject=subject or 'N/A', previous_summary=previous_summary, new_content=new_content
+        )
 
     # ============================================================================
     # IMPORTANCE RATING PROMPTS
     # ============================================================================
     
-    @staticmethod
-    def importance_prompt(email_summary: str, category: str, subject: str = "") -> str:
+    @classmethod
+    def importance_prompt(cls, email_summary: str, category: str, subject: str = "") -> str:
         """
         Generate importance rating prompt for priority assessment.
         
@@ -124,35 +259,9 @@ TASK: Provide a clear, concise summary following the above guidelines."""
         Returns:
             str: Formatted prompt for importance rating
         """
-        return f"""You are an email importance analyzer. Rate the importance of this email.
-
-EMAIL DETAILS:
-Subject: {subject if subject else 'N/A'}
-Category: {category}
-
-EMAIL SUMMARY:
-{'-' * 60}
-{email_summary}
-{'-' * 60}
-
-IMPORTANCE SCALE:
-• LOW: Routine emails, newsletters, non-urgent notifications, general information, social updates
-• MEDIUM: Regular work communications, meeting requests, follow-ups, planned tasks, non-urgent updates  
-• HIGH: Important business matters, time-sensitive requests, deadline reminders, significant decisions needed
-• URGENT: Critical deadlines (within 24-48 hours), important client issues, system problems, immediate action required
-• CRITICAL: Emergency situations, security alerts, system failures, legal issues, CEO-level communications, immediate crisis response needed
-
-EVALUATION CRITERIA:
-1. Time sensitivity and deadlines (immediate, hours, days, weeks)
-2. Business impact (revenue, operations, reputation)
-3. Action urgency required from recipient
-4. Sender's authority/position in organization
-5. Consequences of delay (minor inconvenience vs major business impact)
-6. Security or legal implications
-
-TASK: Rate this email's importance using the scale above.
-
-RESPONSE: Respond with ONLY one word: low, medium, high, urgent, or critical"""
+        return cls.IMPORTANCE_TEMPLATE.render(
+            subject=subject or 'N/A', category=category, email_summary=email_summary
+        )
 
     # ============================================================================
     # SYSTEM CONFIGURATION
@@ -188,6 +297,7 @@ RESPONSE: Respond with ONLY one word: low, medium, high, urgent, or critical"""
         return {
             "categorizer": "Email classification into predefined categories",
             "summarizer": "Extract essential information in readable format", 
+            "thread_summary": "Merge a new reply into a running conversation summary",
             "importance": "Rate email importance on 5-level scale"
         }
         
@@ -212,10 +322,49 @@ RESPONSE: Respond with ONLY one word: low, medium, high, urgent, or critical"""
                 "output": "Natural language summary (2-3 sentences)",
                 "format": "Conversational, no formatting marks"
             },
+            "thread_summary": {
+                "description": "Merges a new reply into a running conversation summary",
+                "input": ["previous_summary", "new_content", "subject"],
+                "output": "Updated conversation summary (2-3 sentences)",
+                "format": "Conversational, no formatting marks"
+            },
             "importance": {
                 "description": "Rates email importance on 5-level scale",
                 "input": ["email_summary", "category", "subject"],
                 "output": "Importance level (string)",
                 "scale": ["low", "medium", "high", "urgent", "critical"]
             }
-        }
\ No newline at end of file
+        }
+    
+    # ============================================================================
+    # PROMPT STATISTICS
+    # ============================================================================
+    
+    @classmethod
+    def set_stats_hook(cls, hook) -> None:
+        """
+        Register a callback receiving prompt sizes on every render.
+        
+        Args:
+            hook (callable): Called as hook(name, static_chars, variable_chars), or None to disable
+        """
+        PromptTemplate.stats_hook = hook
+    
+    @classmethod
+    def get_prompt_stats(cls) -> dict:
+        """
+        Get size statistics of every compiled prompt template.
+        
+        Returns:
+            dict: Per prompt type: renders, static prefix size and average variable size (chars)
+        """
+        stats = {}
+        for template in PromptTemplate.registry:
+            entry = stats.setdefault(template.name, {
+                "renders": 0, "static_prefix_chars": len(template.static_prefix), "variable_chars": 0
+            })
+            entry["renders"] += template.renders
+            entry["variable_chars"] += template.variable_chars
+        for entry in stats.values():
+            entry["avg_variable_chars"] = entry["variable_chars"] // entry["renders"] if entry["renders"] else 0
+        return stats